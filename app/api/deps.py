@@ -1,18 +1,43 @@
 from __future__ import annotations
 
-from fastapi import Depends, HTTPException, status
-from fastapi.security import OAuth2PasswordBearer
+import math
+import time
+from collections.abc import Generator
+from dataclasses import dataclass
+
+from fastapi import Depends, HTTPException, Request, Response, status
+from fastapi.security import APIKeyHeader, OAuth2PasswordBearer
 from sqlalchemy import select
 from sqlalchemy.orm import Session, joinedload
 
-from app.core.security import decode_token
-from app.db.session import get_db
+from app.core.config import settings
+from app.core.permissions import WILDCARD_MASK, has_permission, permission_mask, token_permission_mask
+from app.core.security import LAST_WRITE_CLAIM, decode_token
+from app.db.session import get_db, read_router, read_session_scope, read_with_fallback
 from app.models import Role, User
+from app.services.api_keys import api_key_service
+from app.services.audit import audit_logger
+from app.services.revocation import revocation_store
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/auth/token", auto_error=False)
+api_key_scheme = APIKeyHeader(name="X-API-Key", auto_error=False)
+# Epoch seconds of the caller's last write, used to pin reads to the primary until replicas catch up.
+LAST_WRITE_COOKIE = "last_write"
+# Same value for bearer-only clients that keep no cookies: echo it back on the next requests.
+LAST_WRITE_HEADER = "X-Last-Write"
+
+
+@dataclass
+class Principal:
+    """Caller identity shared by user tokens and service API keys."""
 
+    role_name: str
+    permissions: int
+    user: User | None = None
+    api_key_id: int | None = None
 
-async def get_current_user(token: str | None = Depends(oauth2_scheme), db: Session = Depends(get_db)) -> User:
+
+async def get_token_payload(token: str | None = Depends(oauth2_scheme), db: Session = Depends(get_db)) -> dict:
     if not token:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Missing authentication token")
 
@@ -21,36 +46,162 @@ async def get_current_user(token: str | None = Depends(oauth2_scheme), db: Sessi
     except Exception as exc:  # pragma: no cover - jwt raises various subclasses
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token") from exc
 
+    jti = payload.get("jti")
+    if jti:
+        revocation_store.sync(db)
+        if revocation_store.is_revoked(jti):
+            raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Token has been revoked")
+    return payload
+
+
+def _token_user_id(payload: dict) -> int:
     user_id = payload.get("sub")
     if not user_id:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token")
 
     try:
-        user_id_int = int(user_id)
+        return int(user_id)
     except (TypeError, ValueError) as exc:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token payload") from exc
 
+
+def mark_write(response: Response) -> None:
+    """Pin the caller's reads to the primary for the read-your-writes window, on every worker."""
+    if not read_router.has_replicas:
+        return
+    written_at = f"{time.time():.3f}"
+    response.headers[LAST_WRITE_HEADER] = written_at
+    response.set_cookie(
+        LAST_WRITE_COOKIE,
+        written_at,
+        max_age=math.ceil(settings.replica_read_your_writes_seconds),
+        httponly=True,
+        samesite="lax",
+    )
+
+
+def _last_write(request: Request, payload: dict | None = None) -> float | None:
+    candidates = [
+        request.cookies.get(LAST_WRITE_COOKIE),
+        request.headers.get(LAST_WRITE_HEADER),
+        payload.get(LAST_WRITE_CLAIM) if payload else None,
+    ]
+    timestamps = []
+    for value in candidates:
+        try:
+            timestamps.append(float(value))
+        except (TypeError, ValueError):
+            continue
+    return max(timestamps, default=None)
+
+
+def get_read_db(request: Request, db: Session = Depends(get_db)) -> Generator[Session, None, None]:
+    with read_session_scope(db, last_write=_last_write(request)) as read_db:
+        yield read_db
+
+
+def get_user_read_db(
+    request: Request, payload: dict = Depends(get_token_payload), db: Session = Depends(get_db)
+) -> Generator[Session, None, None]:
+    """Read session for the token's user; pinned to the primary right after that user's own writes."""
+    with read_session_scope(db, last_write=_last_write(request, payload)) as read_db:
+        yield read_db
+
+
+def _load_user(payload: dict, read_db: Session, db: Session) -> User:
+    user_id_int = _token_user_id(payload)
+
     statement = (
         select(User)
         .options(joinedload(User.role).joinedload(Role.apis))
         .where(User.id == user_id_int)
     )
-    user = db.scalars(statement).first()
+    user = read_with_fallback(read_db, db, lambda session: session.scalars(statement).unique().first())
+    if not user and read_db is not db:
+        # The account may be too new to have reached the replica yet.
+        user = db.scalars(statement).unique().first()
     if not user:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="User no longer exists")
 
     return user
 
 
+async def get_current_user(
+    payload: dict = Depends(get_token_payload),
+    read_db: Session = Depends(get_user_read_db),
+    db: Session = Depends(get_db),
+) -> User:
+    return _load_user(payload, read_db, db)
+
+
+def _audit_denial(request: Request, api_name: str, *, identifier: str | None, user_id: int | None = None) -> None:
+    audit_logger.record(
+        "permission.denied",
+        identifier=identifier,
+        user_id=user_id,
+        client_ip=request.client.host if request.client else None,
+        detail=f"{api_name} {request.method} {request.url.path}",
+    )
+
+
+def _user_permission_mask(payload: dict, user: User) -> int:
+    mask = token_permission_mask(payload)
+    if "pm" not in payload and user.role and user.role.is_superuser:
+        # Legacy string-list tokens: superuser status comes from the role, never from a "*" entry.
+        mask |= WILDCARD_MASK
+    return mask
+
+
 def require_permission(api_name: str):
-    def dependency(user: User = Depends(get_current_user)) -> User:
-        role = user.role
-        if not role:
-            raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="User has no role assigned")
-        if role.is_superuser:
-            return user
-        if any(api.api_name == api_name for api in role.apis):
+    # Resolved once per route at import time, so an unregistered name fails at startup.
+    required = permission_mask([api_name], strict=True)
+
+    def dependency(
+        request: Request,
+        payload: dict = Depends(get_token_payload),
+        user: User = Depends(get_current_user),
+    ) -> User:
+        if user.role and has_permission(_user_permission_mask(payload, user), required):
             return user
+        _audit_denial(request, api_name, identifier=user.username, user_id=user.id)
+        if not user.role:
+            raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="User has no role assigned")
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Role not permitted to access this resource")
+
+    return dependency
+
+
+async def get_current_principal(
+    request: Request,
+    api_key: str | None = Depends(api_key_scheme),
+    token: str | None = Depends(oauth2_scheme),
+    db: Session = Depends(get_db),
+) -> Principal:
+    if api_key:
+        cached = api_key_service.authenticate(db, api_key)
+        if cached is None:
+            raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid API key")
+        return Principal(role_name=cached.role_name, permissions=cached.permissions, api_key_id=cached.id)
+
+    payload = await get_token_payload(token, db)
+    with read_session_scope(db, last_write=_last_write(request, payload)) as read_db:
+        user = _load_user(payload, read_db, db)
+    if not user.role:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="User has no role assigned")
+    return Principal(role_name=user.role.name, permissions=_user_permission_mask(payload, user), user=user)
+
+
+def require_principal_permission(api_name: str):
+    """Like `require_permission`, but also accepts service callers authenticating with an API key."""
+    required = permission_mask([api_name], strict=True)
+
+    def dependency(request: Request, principal: Principal = Depends(get_current_principal)) -> Principal:
+        if has_permission(principal.permissions, required):
+            return principal
+        if principal.user is not None:
+            _audit_denial(request, api_name, identifier=principal.user.username, user_id=principal.user.id)
+        else:
+            _audit_denial(request, api_name, identifier=f"api-key:{principal.api_key_id}")
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Role not permitted to access this resource")
 
     return dependency
@@ -1,42 +1,79 @@
 from __future__ import annotations
 
 import logging
+import math
+import time
+from datetime import datetime, timedelta, timezone
+from uuid import uuid4
 
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy import or_, select
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import delete, or_, select, update
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session, joinedload
 from fastapi.security import OAuth2PasswordRequestForm
 
+from app.api.deps import get_read_db, get_token_payload, mark_write
 from app.core.config import settings
-from app.core.security import create_access_token, hash_password, verify_password
-from app.db.session import get_db
-from app.models import Role, RoleAPI, User
-from app.schemas import LoginRequest, SignupRequest, TokenSchema, UserRead
+from app.core.security import (
+    create_access_token,
+    generate_refresh_token,
+    hash_password,
+    hash_refresh_token,
+    verify_and_update_password,
+)
+from app.db.session import get_db, read_router, read_with_fallback
+from app.models import RefreshToken, Role, RoleAPI, User
+from app.schemas import (
+    LoginRequest,
+    LogoutRequest,
+    RefreshRequest,
+    RoleSchema,
+    SignupRequest,
+    TokenSchema,
+    UserRead,
+)
+from app.services.audit import audit_logger
 from app.services.email import email_service
+from app.services.rate_limit import login_throttle
+from app.services.revocation import revocation_store
+from app.services.roles import DEFAULT_ROLE_PERMISSIONS, role_cache
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/auth", tags=["auth"])
 
 
-@router.post("/signup", response_model=UserRead, status_code=status.HTTP_201_CREATED)
-async def signup(payload: SignupRequest, db: Session = Depends(get_db)) -> UserRead:
-    if db.scalar(select(User).where(User.username == payload.username)):
-        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Username already taken")
-    if db.scalar(select(User).where(User.email == payload.email)):
-        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Email already registered")
+def _create_role_on_demand(db: Session, role_name: str) -> RoleSchema:
+    """Slow path for roles missing from the cache; the default role is normally seeded at startup."""
+    role = Role(name=role_name, description="Default role created on demand")
+    db.add(role)
+    db.flush()
+    if role_name == settings.default_role_name:
+        for api_name in DEFAULT_ROLE_PERMISSIONS:
+            db.add(RoleAPI(role_id=role.id, api_name=api_name))
+        db.flush()
+    db.refresh(role)
+    return RoleSchema.model_validate(role)
+
 
+def _duplicate_user_detail(exc: IntegrityError) -> str | None:
+    message = str(exc.orig)
+    # SQLite reports "users.<column>", Postgres the index name and "Key (<column>)=".
+    for column, detail in (("username", "Username already taken"), ("email", "Email already registered")):
+        if f"users.{column}" in message or f"ix_users_{column}" in message or f"({column})=" in message:
+            return detail
+    return None
+
+
+@router.post("/signup", response_model=UserRead, status_code=status.HTTP_201_CREATED)
+async def signup(payload: SignupRequest, response: Response, db: Session = Depends(get_db)) -> UserRead:
     role_name = payload.role_name or settings.default_role_name
-    role = db.scalar(select(Role).where(Role.name == role_name))
-    if role is None:
-        role = Role(name=role_name, description="Default role created on demand")
-        db.add(role)
-        db.flush()
-    if role_name == settings.default_role_name and not any(api.api_name == "files:profile-picture" for api in role.apis):
-        db.add(RoleAPI(role_id=role.id, api_name="files:profile-picture"))
+    role = role_cache.get(db, role_name) or _create_role_on_demand(db, role_name)
 
     try:
-        hashed_password = hash_password(payload.password)
+        # bcrypt is CPU-bound; keep it off the event loop serving the read routes.
+        hashed_password = await run_in_threadpool(hash_password, payload.password)
     except ValueError as exc:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc)) from exc
 
@@ -46,56 +83,213 @@ async def signup(payload: SignupRequest, db: Session = Depends(get_db)) -> UserR
         last_name=payload.last_name,
         email=payload.email,
         hashed_password=hashed_password,
-        role=role,
+        role_id=role.id,
     )
 
+    # A single INSERT: the unique constraints on username/email reject duplicates, and the
+    # response is built from the payload and cached role instead of re-reading the row.
     db.add(user)
-    db.commit()
-    db.refresh(user)
+    try:
+        db.flush()
+        created = UserRead(
+            id=user.id,
+            username=payload.username,
+            first_name=payload.first_name,
+            last_name=payload.last_name,
+            email=payload.email,
+            role=role,
+        )
+        db.commit()
+    except IntegrityError as exc:
+        db.rollback()
+        detail = _duplicate_user_detail(exc)
+        if detail is None:
+            raise
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=detail) from exc
+    mark_write(response)
 
     try:
         await email_service.send_mail_async(
             subject="Welcome to the FastAPI template",
-            recipients=[user.email],
-            body=f"Hi {user.first_name}, your account has been created successfully.",
+            recipients=[payload.email],
+            body=f"Hi {payload.first_name}, your account has been created successfully.",
         )
     except Exception as exc:  # pragma: no cover - depends on external service
         logger.warning("Failed to send welcome email: %s", exc)
 
-    return user
+    return created
 
 
-def _issue_token(user: User) -> TokenSchema:
+def _last_write_claim(user: User, *, found_on_primary: bool) -> float | None:
+    """Value of the token's last-write claim, set only while replicas may still lag behind the user."""
+    if not read_router.has_replicas:
+        return None
+    now = time.time()
+    if found_on_primary:
+        # The replica missed this user at login, so it is behind regardless of updated_at.
+        return now
+    updated_at = user.updated_at.replace(tzinfo=timezone.utc).timestamp()
+    return updated_at if now - updated_at < settings.replica_read_your_writes_seconds else None
+
+
+def _issue_token(
+    db: Session, user: User, *, family_id: str | None = None, found_on_primary: bool = False
+) -> TokenSchema:
+    """Mint an access token plus a rotating refresh token (a new family unless one is given)."""
     role = user.role
     if not role:
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="User role missing")
-    permissions = [api.api_name for api in role.apis] if not role.is_superuser else ["*"]
-    token = create_access_token(subject=str(user.id), role=role.name, permissions=permissions)
-    return TokenSchema(access_token=token)
+    token = create_access_token(
+        subject=str(user.id),
+        role=role.name,
+        permissions=[api.api_name for api in role.apis],
+        is_superuser=role.is_superuser,
+        last_write=_last_write_claim(user, found_on_primary=found_on_primary),
+    )
+
+    refresh_token = generate_refresh_token()
+    db.add(
+        RefreshToken(
+            user_id=user.id,
+            token_hash=hash_refresh_token(refresh_token),
+            family_id=family_id or uuid4().hex,
+            expires_at=datetime.utcnow() + timedelta(days=settings.refresh_token_expire_days),
+        )
+    )
+    db.commit()
+    return TokenSchema(access_token=token, refresh_token=refresh_token)
+
+
+def _revoke_refresh_family(db: Session, family_id: str) -> None:
+    db.execute(
+        update(RefreshToken)
+        .where(RefreshToken.family_id == family_id, RefreshToken.revoked_at.is_(None))
+        .values(revoked_at=datetime.utcnow())
+    )
+    db.commit()
 
 
-def _authenticate(db: Session, identifier: str, password: str) -> User:
+def _authenticate(db: Session, read_db: Session, identifier: str, password: str) -> tuple[User, bool]:
+    """Verify the credentials; also report whether the user had to be read from the primary."""
     statement = (
         select(User)
         .options(joinedload(User.role).joinedload(Role.apis))
         .where(or_(User.username == identifier, User.email == identifier))
     )
-    user = db.scalars(statement).first()
-    if not user or not verify_password(password, user.hashed_password):
+    user = read_with_fallback(read_db, db, lambda session: session.scalars(statement).unique().first())
+    found_on_primary = False
+    if not user and read_db is not db:
+        # The account may be too new to have reached the replica yet.
+        user = db.scalars(statement).unique().first()
+        found_on_primary = user is not None
+    if not user:
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid credentials")
+    verified, new_hash = verify_and_update_password(password, user.hashed_password)
+    if not verified:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid credentials")
-    return user
+    if new_hash:
+        # Cost or scheme changed since this hash was written: upgrade it while we hold the plaintext.
+        db.execute(update(User).where(User.id == user.id).values(hashed_password=new_hash))
+        db.commit()
+    return user, found_on_primary
+
+
+def _throttled_authenticate(
+    request: Request, db: Session, read_db: Session, identifier: str, password: str
+) -> tuple[User, bool]:
+    """Reject throttled or locked-out callers before any database lookup or bcrypt work."""
+    client_ip = request.client.host if request.client else "unknown"
+    retry_after = login_throttle.check(identifier, client_ip)
+    if retry_after:
+        audit_logger.record("login.throttled", identifier=identifier, client_ip=client_ip)
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail="Too many login attempts",
+            headers={"Retry-After": str(math.ceil(retry_after))},
+        )
+    try:
+        user, found_on_primary = _authenticate(db, read_db, identifier, password)
+    except HTTPException:
+        login_throttle.record_failure(identifier, client_ip)
+        audit_logger.record("login.failed", identifier=identifier, client_ip=client_ip)
+        raise
+    login_throttle.record_success(identifier, client_ip)
+    audit_logger.record("login.succeeded", identifier=identifier, user_id=user.id, client_ip=client_ip)
+    return user, found_on_primary
 
 
 @router.post("/login", response_model=TokenSchema)
-async def login(payload: LoginRequest, db: Session = Depends(get_db)) -> TokenSchema:
-    user = _authenticate(db, payload.username, payload.password)
-    return _issue_token(user)
+def login(
+    payload: LoginRequest,
+    request: Request,
+    db: Session = Depends(get_db),
+    read_db: Session = Depends(get_read_db),
+) -> TokenSchema:
+    user, found_on_primary = _throttled_authenticate(request, db, read_db, payload.username, payload.password)
+    return _issue_token(db, user, found_on_primary=found_on_primary)
 
 
 @router.post("/token", response_model=TokenSchema)
-async def login_with_form(
+def login_with_form(
+    request: Request,
     form_data: OAuth2PasswordRequestForm = Depends(),
     db: Session = Depends(get_db),
+    read_db: Session = Depends(get_read_db),
 ) -> TokenSchema:
-    user = _authenticate(db, form_data.username, form_data.password)
-    return _issue_token(user)
+    user, found_on_primary = _throttled_authenticate(request, db, read_db, form_data.username, form_data.password)
+    return _issue_token(db, user, found_on_primary=found_on_primary)
+
+
+@router.post("/refresh", response_model=TokenSchema)
+def refresh(payload: RefreshRequest, db: Session = Depends(get_db)) -> TokenSchema:
+    statement = (
+        select(RefreshToken)
+        .options(joinedload(RefreshToken.user).joinedload(User.role).joinedload(Role.apis))
+        .where(RefreshToken.token_hash == hash_refresh_token(payload.refresh_token))
+    )
+    stored = db.scalars(statement).unique().first()
+    if stored is None:
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid refresh token")
+
+    if stored.revoked_at is not None:
+        # A rotated token came back: assume the family leaked and cut off every descendant.
+        logger.warning("Refresh token reuse detected for user %s (family %s)", stored.user_id, stored.family_id)
+        _revoke_refresh_family(db, stored.family_id)
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Refresh token reuse detected")
+    if stored.expires_at <= datetime.utcnow():
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Refresh token expired")
+
+    # Conditional update so two concurrent refreshes cannot both rotate the same token.
+    rotated = db.execute(
+        update(RefreshToken)
+        .where(RefreshToken.id == stored.id, RefreshToken.revoked_at.is_(None))
+        .values(revoked_at=datetime.utcnow())
+    )
+    if rotated.rowcount != 1:
+        db.rollback()
+        _revoke_refresh_family(db, stored.family_id)
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Refresh token reuse detected")
+    # Expired rows can no longer be exchanged, nor flag reuse; rotated rows stay until then.
+    db.execute(delete(RefreshToken).where(RefreshToken.expires_at <= datetime.utcnow()))
+    return _issue_token(db, stored.user, family_id=stored.family_id)
+
+
+@router.post("/logout", status_code=status.HTTP_204_NO_CONTENT)
+async def logout(
+    payload: LogoutRequest | None = None,
+    token_payload: dict = Depends(get_token_payload),
+    db: Session = Depends(get_db),
+) -> None:
+    """Revoke the presented access token and, when supplied, its refresh token family."""
+    if payload and payload.refresh_token:
+        stored = db.scalar(
+            select(RefreshToken).where(RefreshToken.token_hash == hash_refresh_token(payload.refresh_token))
+        )
+        if stored is not None and str(stored.user_id) == token_payload.get("sub"):
+            _revoke_refresh_family(db, stored.family_id)
+
+    jti = token_payload.get("jti")
+    if jti:
+        expires_at = datetime.fromtimestamp(token_payload["exp"], tz=timezone.utc).replace(tzinfo=None)
+        sub = token_payload.get("sub")
+        revocation_store.revoke(db, jti=jti, expires_at=expires_at, user_id=int(sub) if sub else None)
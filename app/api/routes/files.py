@@ -1,9 +1,10 @@
 from __future__ import annotations
 
-from fastapi import APIRouter, Depends, File, HTTPException, UploadFile, status
+from fastapi import APIRouter, Depends, File, HTTPException, Response, UploadFile, status
+from sqlalchemy import update
 from sqlalchemy.orm import Session
 
-from app.api.deps import require_permission
+from app.api.deps import mark_write, require_permission
 from app.db.session import get_db
 from app.models import User
 from app.schemas import UserRead
@@ -14,6 +15,7 @@ router = APIRouter(prefix="/files", tags=["files"])
 
 @router.post("/profile-picture", response_model=UserRead)
 async def upload_profile_picture(
+    response: Response,
     file: UploadFile = File(...),
     current_user: User = Depends(require_permission("files:profile-picture")),
     db: Session = Depends(get_db),
@@ -25,8 +27,9 @@ async def upload_profile_picture(
         location = await storage_service.save_profile_picture(current_user.id, file)
     except RuntimeError as exc:
         raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=str(exc)) from exc
-    current_user.profile_image_url = location
-    db.add(current_user)
+    # current_user was loaded through a read session, so write through the primary by id.
+    db.execute(update(User).where(User.id == current_user.id).values(profile_image_url=location))
     db.commit()
-    db.refresh(current_user)
+    mark_write(response)
+    current_user.profile_image_url = location
     return current_user
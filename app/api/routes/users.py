@@ -2,10 +2,10 @@ from __future__ import annotations
 
 from fastapi import APIRouter, Depends
 
-from app.api.deps import get_current_user, require_permission
+from app.api.deps import get_current_user, get_read_db, require_permission
 from app.models import User
 from app.schemas import RoleSchema, UserRead
-from app.db.session import get_db
+from app.db.session import get_db, read_with_fallback
 from sqlalchemy.orm import Session
 from sqlalchemy import select
 from app.models import Role
@@ -21,7 +21,8 @@ async def read_current_user(current_user: User = Depends(get_current_user)) -> U
 @router.get("/roles", response_model=list[RoleSchema])
 async def list_roles(
     _: User = Depends(require_permission("admin:roles")),
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
+    primary: Session = Depends(get_db),
 ) -> list[Role]:
-    roles = db.scalars(select(Role)).all()
+    roles = read_with_fallback(db, primary, lambda session: session.scalars(select(Role)).all())
     return roles
@@ -1,6 +1,8 @@
 from __future__ import annotations
 
 import getpass
+import time
+from datetime import datetime, timedelta
 from pathlib import Path
 from typing import Iterable
 
@@ -11,13 +13,49 @@ from sqlalchemy import or_, select
 from sqlalchemy.orm import Session
 
 from app.core.config import settings
-from app.core.security import MAX_PASSWORD_BYTES, hash_password, reset_key_cache
+from app.core.security import (
+    MAX_PASSWORD_BYTES,
+    build_password_context,
+    generate_api_key,
+    hash_api_key,
+    hash_password,
+    reset_key_cache,
+)
 from app.db import Base
 from app.db.session import SessionLocal, engine
-from app.models import Role, RoleAPI, User
+from app.models import APIKey, AuditEvent, Role, RoleAPI, User
 
 cli = typer.Typer(help="Utility commands for the FastAPI template")
 
+DUMMY_ROLE_DEFINITIONS: list[dict] = [
+    {
+        "name": settings.super_admin_role_name,
+        "description": "Super admins can access everything",
+        "permissions": ["*"],
+        "is_superuser": True,
+    },
+    {
+        "name": "finance_analyst",
+        "description": "Finance can view finance reports",
+        "permissions": ["reports:finance"],
+    },
+    {
+        "name": "operations_manager",
+        "description": "Operations can read their reports",
+        "permissions": ["reports:operations"],
+    },
+    {
+        "name": "support_agent",
+        "description": "Support agents can manage tickets",
+        "permissions": ["support:tickets:view", "support:tickets:create"],
+    },
+    {
+        "name": settings.default_role_name,
+        "description": "Basic user with profile upload access",
+        "permissions": ["files:profile-picture"],
+    },
+]
+
 
 @cli.command("generate-keys")
 def generate_keys(
@@ -108,38 +146,9 @@ def create_super_admin(
 
 @cli.command("seed-dummy-data")
 def seed_dummy_data() -> None:
-    role_definitions = [
-        {
-            "name": settings.super_admin_role_name,
-            "description": "Super admins can access everything",
-            "permissions": ["*"],
-            "is_superuser": True,
-        },
-        {
-            "name": "finance_analyst",
-            "description": "Finance can view finance reports",
-            "permissions": ["reports:finance"],
-        },
-        {
-            "name": "operations_manager",
-            "description": "Operations can read their reports",
-            "permissions": ["reports:operations"],
-        },
-        {
-            "name": "support_agent",
-            "description": "Support agents can manage tickets",
-            "permissions": ["support:tickets:view", "support:tickets:create"],
-        },
-        {
-            "name": settings.default_role_name,
-            "description": "Basic user with profile upload access",
-            "permissions": ["files:profile-picture"],
-        },
-    ]
-
     Base.metadata.create_all(bind=engine)
     with SessionLocal() as session:
-        for role_def in role_definitions:
+        for role_def in DUMMY_ROLE_DEFINITIONS:
             _get_or_create_role(session, **role_def)
 
         dummy_users = [
@@ -193,5 +202,102 @@ def seed_dummy_data() -> None:
     typer.echo("Dummy roles and users have been created.")
 
 
+def _time_hash(scheme: str, cost: int, samples: int) -> float:
+    """Median milliseconds to hash a password with ``scheme`` at ``cost`` (bcrypt rounds / argon2 time cost)."""
+    context = build_password_context(
+        [scheme],
+        bcrypt_rounds=cost,
+        argon2_time_cost=cost,
+        argon2_memory_cost=settings.argon2_memory_cost,
+        argon2_parallelism=settings.argon2_parallelism,
+    )
+    timings = []
+    for _ in range(samples):
+        started = time.perf_counter()
+        context.hash("calibration-password")
+        timings.append((time.perf_counter() - started) * 1000)
+    return sorted(timings)[len(timings) // 2]
+
+
+@cli.command("calibrate-password-hash")
+def calibrate_password_hash(
+    target_ms: float = typer.Option(250.0, help="Acceptable hashing latency per login on this machine"),
+    scheme: str = typer.Option("bcrypt", help="bcrypt, or argon2 (memory-hard)"),
+    samples: int = typer.Option(3, min=1, help="Hashes timed per cost level"),
+) -> None:
+    cost_ranges = {"bcrypt": range(8, 20), "argon2": range(1, 16)}
+    if scheme not in cost_ranges:
+        raise typer.BadParameter("Scheme must be 'bcrypt' or 'argon2'")
+
+    recommended: int | None = None
+    for cost in cost_ranges[scheme]:
+        elapsed = _time_hash(scheme, cost, samples)
+        typer.echo(f"{scheme} cost {cost}: {elapsed:.1f} ms")
+        if elapsed > target_ms:
+            break
+        recommended = cost
+
+    if recommended is None:
+        typer.echo(f"Even the lowest {scheme} cost exceeds {target_ms:.0f} ms on this machine.")
+        raise typer.Exit(code=1)
+    setting = "BCRYPT_ROUNDS" if scheme == "bcrypt" else "ARGON2_TIME_COST"
+    typer.echo(f"Recommended: {setting}={recommended} (target {target_ms:.0f} ms)")
+
+
+@cli.command("create-api-key")
+def create_api_key(
+    name: str = typer.Option(..., help="Label of the calling service"),
+    role_name: str = typer.Option(..., help="Role whose permissions the key receives"),
+) -> None:
+    Base.metadata.create_all(bind=engine)
+    with SessionLocal() as session:
+        role = session.scalars(select(Role).where(Role.name == role_name)).first()
+        if not role:
+            raise typer.BadParameter(f"Role {role_name!r} does not exist")
+        key, prefix = generate_api_key()
+        session.add(APIKey(name=name, prefix=prefix, key_hash=hash_api_key(key), role_id=role.id))
+        session.commit()
+    typer.echo(f"API key for {name} (prefix {prefix}); store it now, it cannot be shown again:")
+    typer.echo(key)
+
+
+@cli.command("revoke-api-key")
+def revoke_api_key(prefix: str = typer.Option(..., help="Prefix printed when the key was created")) -> None:
+    Base.metadata.create_all(bind=engine)
+    with SessionLocal() as session:
+        api_key = session.scalars(select(APIKey).where(APIKey.prefix == prefix)).first()
+        if not api_key:
+            raise typer.BadParameter(f"No API key with prefix {prefix!r}")
+        api_key.revoked_at = api_key.revoked_at or datetime.utcnow()
+        session.commit()
+    typer.echo(f"API key {prefix} revoked")
+
+
+@cli.command("audit-log")
+def audit_log(
+    event_type: str | None = typer.Option(None, help="e.g. login.failed, login.throttled, permission.denied"),
+    identifier: str | None = typer.Option(None, help="Username, email or api-key:<id>"),
+    since_hours: float = typer.Option(24.0, help="Only show events from the last N hours"),
+    limit: int = typer.Option(50, min=1, help="Maximum number of events to print"),
+) -> None:
+    Base.metadata.create_all(bind=engine)
+    statement = (
+        select(AuditEvent)
+        .where(AuditEvent.created_at >= datetime.utcnow() - timedelta(hours=since_hours))
+        .order_by(AuditEvent.created_at.desc())
+        .limit(limit)
+    )
+    if event_type:
+        statement = statement.where(AuditEvent.event_type == event_type)
+    if identifier:
+        statement = statement.where(AuditEvent.identifier == identifier)
+    with SessionLocal() as session:
+        for event in session.scalars(statement):
+            typer.echo(
+                f"{event.created_at.isoformat(timespec='seconds')}  {event.event_type:<18} "
+                f"{event.identifier or '-'}  ip={event.client_ip or '-'}  {event.detail or ''}".rstrip()
+            )
+
+
 if __name__ == "__main__":
     cli()
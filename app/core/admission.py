@@ -0,0 +1,125 @@
+from __future__ import annotations
+
+import json
+import time
+
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from app.core.config import settings
+
+# Multiplicative decrease applied when a request overshoots its class latency target.
+BACKOFF_RATIO = 0.9
+# Uploads hold a database connection for their whole duration; leave the rest of the pool to other routes.
+UPLOAD_POOL_SHARE = 0.5
+# Auth routes that hash or verify a password; refresh and logout are cheap and stay in the read class.
+PASSWORD_AUTH_PATHS = ("/auth/signup", "/auth/login", "/auth/token")
+
+
+def upload_concurrency_limit() -> int:
+    pool_capacity = settings.database_pool_size + settings.database_max_overflow
+    return max(1, min(settings.admission_upload_max_concurrency, int(pool_capacity * UPLOAD_POOL_SHARE)))
+
+
+class AdaptiveLimiter:
+    """AIMD concurrency limit: grow by ~1 per window of fast responses, shrink on slow ones."""
+
+    def __init__(self, name: str, *, max_limit: int, target_latency_ms: float, min_limit: int = 1) -> None:
+        self.name = name
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.target_latency = target_latency_ms / 1000
+        self.limit = float(max_limit)
+        self.in_flight = 0
+        self._last_decrease = 0.0
+
+    def try_acquire(self) -> bool:
+        if self.in_flight >= int(self.limit):
+            return False
+        self.in_flight += 1
+        return True
+
+    def release(self, latency: float) -> None:
+        self.in_flight -= 1
+        now = time.monotonic()
+        if latency > self.target_latency:
+            # Back off at most once per target interval so one burst does not collapse the limit.
+            if now - self._last_decrease >= self.target_latency:
+                self.limit = max(self.min_limit, self.limit * BACKOFF_RATIO)
+                self._last_decrease = now
+        else:
+            self.limit = min(self.max_limit, self.limit + 1 / self.limit)
+
+
+class AdmissionControlMiddleware:
+    """Sheds excess requests per route class with 503 instead of letting them queue.
+
+    Password auth (bcrypt + RSA) and upload routes get their own small limits so they cannot starve the
+    read routes; the healthcheck is never limited.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+        self.limiters = {
+            "auth": AdaptiveLimiter(
+                "auth",
+                max_limit=settings.admission_auth_max_concurrency,
+                target_latency_ms=settings.admission_auth_target_latency_ms,
+            ),
+            "upload": AdaptiveLimiter(
+                "upload",
+                max_limit=upload_concurrency_limit(),
+                target_latency_ms=settings.admission_upload_target_latency_ms,
+            ),
+            "read": AdaptiveLimiter(
+                "read",
+                max_limit=settings.admission_read_max_concurrency,
+                target_latency_ms=settings.admission_read_target_latency_ms,
+            ),
+        }
+
+    @staticmethod
+    def classify(path: str) -> str | None:
+        if path == "/":
+            return None
+        if path.startswith(settings.api_prefix) and path[len(settings.api_prefix):] in PASSWORD_AUTH_PATHS:
+            return "auth"
+        if path.startswith(f"{settings.api_prefix}/files/"):
+            return "upload"
+        return "read"
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or not settings.admission_control_enabled:
+            await self.app(scope, receive, send)
+            return
+
+        route_class = self.classify(scope["path"])
+        if route_class is None:
+            await self.app(scope, receive, send)
+            return
+
+        limiter = self.limiters[route_class]
+        if not limiter.try_acquire():
+            await self._shed(send, route_class)
+            return
+
+        started = time.monotonic()
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            limiter.release(time.monotonic() - started)
+
+    @staticmethod
+    async def _shed(send: Send, route_class: str) -> None:
+        body = json.dumps({"detail": f"Server overloaded ({route_class} requests), retry later"}).encode()
+        await send(
+            {
+                "type": "http.response.start",
+                "status": 503,
+                "headers": [
+                    (b"content-type", b"application/json"),
+                    (b"content-length", str(len(body)).encode()),
+                    (b"retry-after", b"1"),
+                ],
+            }
+        )
+        await send({"type": "http.response.body", "body": body})
@@ -14,12 +14,55 @@ class Settings(BaseSettings):
     project_name: str = "FastAPI Template"
     api_prefix: str = "/api"
     database_url: str = "sqlite:///./app.db"
+    database_pool_size: int = 5
+    database_max_overflow: int = 10
+    database_replica_urls: list[str] = []
+    replica_health_check_seconds: float = 10.0
+    replica_read_your_writes_seconds: float = 5.0
 
     private_key_path: Annotated[Path, Field(default=Path("keys/private_key.pem"), description="Path to RSA private key")]
     public_key_path: Annotated[Path, Field(default=Path("keys/public_key.pem"), description="Path to RSA public key")]
-    access_token_expire_minutes: int = 60
+    access_token_expire_minutes: int = 15
+    refresh_token_expire_days: int = 30
+    revocation_sync_interval_seconds: float = 5.0
     token_algorithm: str = "RS256"
 
+    login_rate_limit_enabled: bool = True
+    login_identifier_rate_per_minute: int = 10
+    login_ip_rate_per_minute: int = 60
+    login_lockout_threshold: int = 5
+    login_lockout_base_seconds: float = 30
+    login_lockout_max_seconds: float = 900
+    login_rate_limit_max_keys: int = 100_000
+
+    api_key_hmac_secret: str | None = None
+    api_key_cache_ttl_seconds: float = 60.0
+    api_key_cache_max_entries: int = 10_000
+    api_key_usage_flush_seconds: float = 10.0
+
+    audit_enabled: bool = True
+    audit_queue_size: int = 10_000
+    audit_batch_size: int = 500
+    audit_flush_seconds: float = 2.0
+
+    invalidation_backend: str = "auto"
+    invalidation_poll_seconds: float = 2.0
+
+    admission_control_enabled: bool = True
+    admission_auth_max_concurrency: int = 8
+    admission_auth_target_latency_ms: float = 1000
+    admission_upload_max_concurrency: int = 16
+    admission_upload_target_latency_ms: float = 2000
+    admission_read_max_concurrency: int = 256
+    admission_read_target_latency_ms: float = 250
+
+    # The first scheme hashes new passwords; the others are only verified and upgraded on login.
+    password_schemes: list[str] = ["bcrypt"]
+    bcrypt_rounds: int = 12
+    argon2_time_cost: int = 3
+    argon2_memory_cost: int = 65536
+    argon2_parallelism: int = 4
+
     local_upload_dir: Path = Path("uploads")
     s3_base_url: str | None = None
     s3_bucket_name: str | None = None
@@ -0,0 +1,70 @@
+from __future__ import annotations
+
+import base64
+from typing import Iterable
+
+PERMISSION_ENCODING_VERSION = 1
+
+# Append-only: a name's index is its bit position inside issued tokens, so never reorder or
+# remove entries. Every `require_permission` api_name must be listed here.
+REGISTERED_PERMISSIONS: tuple[str, ...] = (
+    "*",
+    "files:profile-picture",
+    "admin:roles",
+    "reports:finance",
+    "reports:operations",
+    "support:tickets:view",
+    "support:tickets:create",
+)
+PERMISSION_BITS: dict[str, int] = {name: index for index, name in enumerate(REGISTERED_PERMISSIONS)}
+WILDCARD_MASK = 1 << PERMISSION_BITS["*"]
+
+
+def permission_mask(api_names: Iterable[str], *, is_superuser: bool = False, strict: bool = False) -> int:
+    """Fold permission names into a bitmask; unregistered names are skipped unless ``strict``.
+
+    The wildcard bit comes only from ``is_superuser``: a ``*`` row in ``role_apis`` never grants it.
+    """
+    mask = WILDCARD_MASK if is_superuser else 0
+    for name in api_names:
+        if name == "*":
+            continue
+        bit = PERMISSION_BITS.get(name)
+        if bit is None:
+            if strict:
+                raise ValueError(f"Permission {name!r} is not registered in app.core.permissions.REGISTERED_PERMISSIONS")
+            continue
+        mask |= 1 << bit
+    return mask
+
+
+def encode_permissions(api_names: Iterable[str], *, is_superuser: bool = False) -> str:
+    mask = permission_mask(api_names, is_superuser=is_superuser)
+    raw = mask.to_bytes(max(1, (mask.bit_length() + 7) // 8), "little")
+    return base64.urlsafe_b64encode(raw).rstrip(b"=").decode("ascii")
+
+
+def decode_permissions(encoded: str) -> int:
+    padded = encoded + "=" * (-len(encoded) % 4)
+    return int.from_bytes(base64.urlsafe_b64decode(padded), "little")
+
+
+def token_permission_mask(payload: dict) -> int:
+    """Permission bitmask of a decoded token, accepting legacy ``perms`` string lists too.
+
+    Legacy lists never yield the wildcard bit; callers must take superuser status from the role.
+    """
+    encoded = payload.get("pm")
+    if isinstance(encoded, str) and payload.get("pv") == PERMISSION_ENCODING_VERSION:
+        try:
+            return decode_permissions(encoded)
+        except ValueError:
+            return 0
+    legacy = payload.get("perms")
+    if isinstance(legacy, list):
+        return permission_mask(legacy)
+    return 0
+
+
+def has_permission(mask: int, required: int) -> bool:
+    return bool(mask & (required | WILDCARD_MASK))
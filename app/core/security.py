@@ -1,15 +1,63 @@
 from __future__ import annotations
 
+import hashlib
+import hmac
+import secrets
 from datetime import datetime, timedelta, timezone
 from functools import lru_cache
+from uuid import uuid4
 
 import jwt
 from passlib.context import CryptContext
 
 from app.core.config import settings
+from app.core.permissions import PERMISSION_ENCODING_VERSION, encode_permissions
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+
+def build_password_context(
+    schemes: list[str],
+    *,
+    bcrypt_rounds: int,
+    argon2_time_cost: int,
+    argon2_memory_cost: int,
+    argon2_parallelism: int,
+) -> CryptContext:
+    options: dict[str, object] = {}
+    if "bcrypt" in schemes:
+        # min/max_rounds make hashes at any other cost report `needs_update`, so cost changes roll out both ways.
+        options.update(
+            bcrypt__default_rounds=bcrypt_rounds,
+            bcrypt__min_rounds=bcrypt_rounds,
+            bcrypt__max_rounds=bcrypt_rounds,
+        )
+    if "argon2" in schemes:
+        options.update(
+            argon2__default_rounds=argon2_time_cost,
+            argon2__min_rounds=argon2_time_cost,
+            argon2__max_rounds=argon2_time_cost,
+            argon2__memory_cost=argon2_memory_cost,
+            argon2__parallelism=argon2_parallelism,
+        )
+    context = CryptContext(schemes=schemes, deprecated="auto", **options)
+    for scheme in schemes:
+        # Backends load lazily, so a missing one would otherwise surface as a 500 on the first hash.
+        has_backend = getattr(context.handler(scheme), "has_backend", None)
+        if has_backend is not None and not has_backend():
+            raise RuntimeError(f"Password scheme {scheme!r} has no backend installed; install passlib[{scheme}]")
+    return context
+
+
+pwd_context = build_password_context(
+    settings.password_schemes,
+    bcrypt_rounds=settings.bcrypt_rounds,
+    argon2_time_cost=settings.argon2_time_cost,
+    argon2_memory_cost=settings.argon2_memory_cost,
+    argon2_parallelism=settings.argon2_parallelism,
+)
 MAX_PASSWORD_BYTES = 100  # bcrypt limitation
+API_KEY_SCHEME = "sk"
+API_KEY_PREFIX_BYTES = 6
+LAST_WRITE_CLAIM = "lwt"
 
 
 @lru_cache(maxsize=1)
@@ -36,9 +84,18 @@ def get_public_key() -> str:
     return key_path.read_text()
 
 
+@lru_cache(maxsize=1)
+def get_api_key_secret() -> bytes:
+    if settings.api_key_hmac_secret:
+        return settings.api_key_hmac_secret.encode("utf-8")
+    # Without a dedicated secret, derive one from the signing key (rotating it invalidates API keys).
+    return hashlib.sha256(get_private_key().encode("utf-8")).digest()
+
+
 def reset_key_cache() -> None:
     get_private_key.cache_clear()
     get_public_key.cache_clear()
+    get_api_key_secret.cache_clear()
 
 
 def _ensure_password_length(password: str) -> None:
@@ -62,11 +119,25 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
         return False
 
 
+def verify_and_update_password(plain_password: str, hashed_password: str) -> tuple[bool, str | None]:
+    """Verify a password and, when the stored hash uses an outdated scheme or cost, return a new hash."""
+    try:
+        _ensure_password_length(plain_password)
+    except ValueError:
+        return False, None
+    try:
+        return pwd_context.verify_and_update(plain_password, hashed_password)
+    except ValueError:
+        return False, None
+
+
 def create_access_token(
     *,
     subject: str,
     role: str,
     permissions: list[str],
+    is_superuser: bool = False,
+    last_write: float | None = None,
     expires_delta: timedelta | None = None,
 ) -> str:
     expire = datetime.now(tz=timezone.utc) + (
@@ -75,10 +146,14 @@ def create_access_token(
     payload = {
         "sub": subject,
         "role": role,
-        "perms": permissions,
+        "pv": PERMISSION_ENCODING_VERSION,
+        "pm": encode_permissions(permissions, is_superuser=is_superuser),
         "exp": expire,
         "iat": datetime.now(tz=timezone.utc),
+        "jti": uuid4().hex,
     }
+    if last_write is not None:
+        payload[LAST_WRITE_CLAIM] = round(last_write, 3)
     private_key = get_private_key()
     return jwt.encode(payload, private_key, algorithm=settings.token_algorithm)
 
@@ -86,3 +161,37 @@ def create_access_token(
 def decode_token(token: str) -> dict:
     public_key = get_public_key()
     return jwt.decode(token, public_key, algorithms=[settings.token_algorithm])
+
+
+def generate_refresh_token() -> str:
+    return secrets.token_urlsafe(48)
+
+
+def hash_refresh_token(token: str) -> str:
+    """Refresh tokens are high-entropy random strings, so a fast digest is enough to store them."""
+    return hashlib.sha256(token.encode("utf-8")).hexdigest()
+
+
+def generate_api_key() -> tuple[str, str]:
+    """Return ``(key, prefix)``; the prefix is the lookup index, the key itself is never stored."""
+    prefix = secrets.token_hex(API_KEY_PREFIX_BYTES)
+    return f"{API_KEY_SCHEME}_{prefix}_{secrets.token_urlsafe(32)}", prefix
+
+
+def api_key_prefix(key: str) -> str | None:
+    scheme, _, rest = key.partition("_")
+    prefix, _, secret = rest.partition("_")
+    if scheme != API_KEY_SCHEME or not secret:
+        return None
+    # Reject malformed prefixes here so junk keys never reach the database.
+    if len(prefix) != API_KEY_PREFIX_BYTES * 2 or prefix.strip("0123456789abcdef"):
+        return None
+    return prefix
+
+
+def hash_api_key(key: str) -> str:
+    return hmac.new(get_api_key_secret(), key.encode("utf-8"), hashlib.sha256).hexdigest()
+
+
+def verify_api_key(key: str, key_hash: str) -> bool:
+    return hmac.compare_digest(hash_api_key(key), key_hash)
@@ -1,2 +1,2 @@
 from app.db.base import Base  # noqa: F401
-from app.db.session import SessionLocal, engine, get_db  # noqa: F401
+from app.db.session import SessionLocal, engine, get_db, read_router  # noqa: F401
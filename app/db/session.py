@@ -1,12 +1,33 @@
-from collections.abc import Generator
+import itertools
+import logging
+import threading
+import time
+from collections.abc import Callable, Generator, Iterator
+from contextlib import contextmanager
+from typing import TypeVar
 
-from sqlalchemy import create_engine
+from sqlalchemy import Engine, create_engine, make_url, text
+from sqlalchemy.exc import OperationalError
 from sqlalchemy.orm import Session, sessionmaker
 
 from app.core.config import settings
 
-connect_args = {"check_same_thread": False} if settings.database_url.startswith("sqlite") else {}
-engine = create_engine(settings.database_url, connect_args=connect_args, future=True)
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+def _create_engine(url: str, **kwargs) -> Engine:
+    connect_args = {"check_same_thread": False} if url.startswith("sqlite") else {}
+    parsed = make_url(url)
+    # In-memory SQLite uses a single-connection pool that takes no sizing options.
+    if not (parsed.get_backend_name() == "sqlite" and parsed.database in (None, "", ":memory:")):
+        kwargs.setdefault("pool_size", settings.database_pool_size)
+        kwargs.setdefault("max_overflow", settings.database_max_overflow)
+    return create_engine(url, connect_args=connect_args, future=True, **kwargs)
+
+
+engine = _create_engine(settings.database_url)
 SessionLocal = sessionmaker(bind=engine, autoflush=False, autocommit=False)
 
 
@@ -16,3 +37,121 @@ def get_db() -> Generator[Session, None, None]:
         yield db
     finally:
         db.close()
+
+
+class ReadRouter:
+    """Hands out read-only sessions round-robin across healthy replicas.
+
+    Callers that wrote within `REPLICA_READ_YOUR_WRITES_SECONDS` are pinned to the primary so they never
+    read a replica that has not caught up with their own change. The last-write time travels with the
+    client (token claim or cookie), so the pin holds whichever worker serves the next request.
+    """
+
+    def __init__(self, urls: list[str], *, health_check_interval: float, read_your_writes_window: float) -> None:
+        self._sessionmakers = [
+            sessionmaker(bind=_create_engine(url, pool_pre_ping=True), autoflush=False, autocommit=False)
+            for url in urls
+        ]
+        self._healthy = [True] * len(urls)
+        self._counter = itertools.count()
+        self._health_check_interval = health_check_interval
+        self._read_your_writes_window = read_your_writes_window
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    @property
+    def has_replicas(self) -> bool:
+        return bool(self._sessionmakers)
+
+    def pinned_to_primary(self, last_write: float | None) -> bool:
+        """Whether a caller whose last write happened at ``last_write`` (epoch seconds) must read the primary."""
+        if last_write is None:
+            return False
+        # abs() so a forged far-future timestamp cannot pin a client forever.
+        return abs(time.time() - last_write) < self._read_your_writes_window
+
+    def session(self, *, last_write: float | None = None) -> Session | None:
+        """A replica session, or None when the caller should read through the primary instead."""
+        if not self.has_replicas or self.pinned_to_primary(last_write):
+            return None
+        for _ in range(len(self._sessionmakers)):
+            index = next(self._counter) % len(self._sessionmakers)
+            if self._healthy[index]:
+                db = self._sessionmakers[index]()
+                db.info["replica_index"] = index
+                return db
+        return None
+
+    def mark_unhealthy(self, index: int) -> None:
+        if self._healthy[index]:
+            logger.warning("Read replica %d marked unhealthy", index)
+        self._healthy[index] = False
+
+    def check_health(self) -> None:
+        for index, factory in enumerate(self._sessionmakers):
+            try:
+                with factory() as db:
+                    db.execute(text("SELECT 1"))
+            except OperationalError as exc:
+                logger.warning("Read replica %d health check failed: %s", index, exc)
+                self._healthy[index] = False
+            else:
+                self._healthy[index] = True
+
+    def start(self) -> None:
+        if not self.has_replicas or self._thread is not None:
+            return
+        self.check_health()
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="replica-health", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        if self._thread is None:
+            return
+        self._stop.set()
+        self._thread.join(timeout=self._health_check_interval)
+        self._thread = None
+
+    def _run(self) -> None:
+        while not self._stop.wait(self._health_check_interval):
+            self.check_health()
+
+
+read_router = ReadRouter(
+    settings.database_replica_urls,
+    health_check_interval=settings.replica_health_check_seconds,
+    read_your_writes_window=settings.replica_read_your_writes_seconds,
+)
+
+
+@contextmanager
+def read_session_scope(primary: Session, *, last_write: float | None = None) -> Iterator[Session]:
+    """Yield a replica session, or the request's own primary session when no replica should serve the read."""
+    db = read_router.session(last_write=last_write)
+    if db is None:
+        yield primary
+        return
+    try:
+        yield db
+    except OperationalError:
+        index = db.info.get("replica_index")
+        if index is not None:
+            read_router.mark_unhealthy(index)
+        raise
+    finally:
+        db.close()
+
+
+def read_with_fallback(read_db: Session, primary: Session, query: Callable[[Session], T]) -> T:
+    """Run ``query`` on ``read_db``; if a replica fails mid-request, take it out of rotation and use the primary."""
+    if read_db is primary:
+        return query(primary)
+    try:
+        return query(read_db)
+    except OperationalError as exc:
+        index = read_db.info.get("replica_index")
+        if index is not None:
+            read_router.mark_unhealthy(index)
+        logger.warning("Read replica query failed, retrying on the primary: %s", exc)
+        return query(primary)
@@ -1,24 +1,36 @@
 from __future__ import annotations
 
+import asyncio
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
 from app import models  # noqa: F401
+from app.api.deps import LAST_WRITE_HEADER
 from app.api.routes import auth, dummy, files, users
+from app.core.admission import AdmissionControlMiddleware
 from app.core.config import settings
 from app.db.base import Base
-from app.db.session import engine
+from app.db.session import SessionLocal, engine, read_router
+from app.services.api_keys import api_key_service
+from app.services.audit import audit_logger
+from app.services.invalidation import invalidation_bus
+from app.services.roles import ensure_default_role, role_cache
+from app.services.revocation import revocation_store
 
 
 def create_app() -> FastAPI:
     app = FastAPI(title=settings.project_name)
 
+    # Middleware added last runs first: CORS wraps admission control so shed 503s keep their CORS headers.
+    app.add_middleware(AdmissionControlMiddleware)
     app.add_middleware(
         CORSMiddleware,
         allow_origins=["*"],
         allow_credentials=True,
         allow_methods=["*"],
         allow_headers=["*"],
+        expose_headers=[LAST_WRITE_HEADER],
     )
 
     app.include_router(auth.router, prefix=settings.api_prefix)
@@ -29,6 +41,45 @@ def create_app() -> FastAPI:
     @app.on_event("startup")
     def _create_tables() -> None:
         Base.metadata.create_all(bind=engine)
+        with SessionLocal() as session:
+            revocation_store.sync(session, force=True)
+            ensure_default_role(session)
+            role_cache.get(session, settings.default_role_name)
+
+    @app.on_event("startup")
+    async def _start_api_key_flusher() -> None:
+        app.state.api_key_flusher = asyncio.create_task(api_key_service.run_flusher())
+
+    @app.on_event("shutdown")
+    def _flush_api_key_usage() -> None:
+        app.state.api_key_flusher.cancel()
+        api_key_service.flush_usage()
+
+    @app.on_event("startup")
+    def _start_invalidation_bus() -> None:
+        invalidation_bus.subscribe(api_key_service.invalidate)
+        invalidation_bus.subscribe(role_cache.clear)
+        invalidation_bus.start()
+
+    @app.on_event("shutdown")
+    def _stop_invalidation_bus() -> None:
+        invalidation_bus.stop()
+
+    @app.on_event("startup")
+    def _start_replica_health_checks() -> None:
+        read_router.start()
+
+    @app.on_event("shutdown")
+    def _stop_replica_health_checks() -> None:
+        read_router.stop()
+
+    @app.on_event("startup")
+    def _start_audit_logger() -> None:
+        audit_logger.start()
+
+    @app.on_event("shutdown")
+    def _stop_audit_logger() -> None:
+        audit_logger.stop()
 
     @app.get("/")
     async def healthcheck() -> dict[str, str]:
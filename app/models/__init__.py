@@ -1,5 +1,10 @@
+from app.models.api_key import APIKey
+from app.models.audit_event import AuditEvent
+from app.models.cache_version import CacheVersion
+from app.models.refresh_token import RefreshToken
+from app.models.revoked_token import RevokedToken
 from app.models.role import Role
 from app.models.role_api import RoleAPI
 from app.models.user import User
 
-__all__ = ["Role", "RoleAPI", "User"]
+__all__ = ["APIKey", "AuditEvent", "CacheVersion", "RefreshToken", "RevokedToken", "Role", "RoleAPI", "User"]
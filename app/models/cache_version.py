@@ -0,0 +1,42 @@
+from __future__ import annotations
+
+from sqlalchemy import Integer, String, event, insert, text, update
+from sqlalchemy.orm import Mapped, Session, mapped_column
+
+from app.db.base import Base
+
+PERMISSIONS_VERSION_KEY = "permissions"
+PERMISSIONS_CHANNEL = "permissions_changed"
+# Tables whose rows feed permission data cached by the workers.
+WATCHED_TABLES = frozenset({"roles", "role_apis", "api_keys"})
+
+
+class CacheVersion(Base):
+    __tablename__ = "cache_versions"
+
+    name: Mapped[str] = mapped_column(String(50), primary_key=True)
+    version: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+
+
+@event.listens_for(Session, "before_flush")
+def _detect_permission_writes(session: Session, flush_context, instances) -> None:
+    changed = (*session.new, *session.dirty, *session.deleted)
+    if any(getattr(obj, "__tablename__", None) in WATCHED_TABLES for obj in changed):
+        session.info["bump_permissions_version"] = True
+
+
+@event.listens_for(Session, "after_flush")
+def _bump_permissions_version(session: Session, flush_context) -> None:
+    """Bump the version in the same transaction as the write, so workers never see one without the other."""
+    if not session.info.pop("bump_permissions_version", False):
+        return
+    connection = session.connection()
+    table = CacheVersion.__table__
+    result = connection.execute(
+        update(table).where(table.c.name == PERMISSIONS_VERSION_KEY).values(version=table.c.version + 1)
+    )
+    if result.rowcount == 0:
+        connection.execute(insert(table).values(name=PERMISSIONS_VERSION_KEY, version=1))
+    if connection.dialect.name == "postgresql":
+        # Delivered to listeners only once the surrounding transaction commits.
+        connection.execute(text("SELECT pg_notify(:channel, '')"), {"channel": PERMISSIONS_CHANNEL})
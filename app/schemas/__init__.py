@@ -1,9 +1,11 @@
-from app.schemas.auth import LoginRequest, SignupRequest, TokenSchema
+from app.schemas.auth import LoginRequest, LogoutRequest, RefreshRequest, SignupRequest, TokenSchema
 from app.schemas.role import RoleAPISchema, RoleCreate, RoleSchema
 from app.schemas.user import UserBase, UserCreate, UserLoginResponse, UserRead
 
 __all__ = [
     "LoginRequest",
+    "LogoutRequest",
+    "RefreshRequest",
     "SignupRequest",
     "TokenSchema",
     "RoleAPISchema",
@@ -0,0 +1,136 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import datetime
+
+import anyio
+from sqlalchemy import bindparam, select, update
+from sqlalchemy.orm import Session, joinedload
+
+from app.core.config import settings
+from app.core.permissions import permission_mask
+from app.core.security import api_key_prefix, verify_api_key
+from app.db.session import SessionLocal
+from app.models import APIKey, Role
+
+logger = logging.getLogger(__name__)
+
+# Unknown and revoked prefixes get their own small cache so junk keys cannot evict valid ones.
+NEGATIVE_CACHE_MAX_ENTRIES = 1_024
+
+
+@dataclass(frozen=True)
+class CachedAPIKey:
+    id: int
+    key_hash: str
+    role_name: str
+    permissions: int
+
+
+class APIKeyService:
+    """Verifies API keys against an in-memory cache and batches their usage counters."""
+
+    def __init__(self) -> None:
+        # prefix -> (key, cache expiry)
+        self._cache: OrderedDict[str, tuple[CachedAPIKey, float]] = OrderedDict()
+        # unknown/revoked prefix -> cache expiry
+        self._unknown: OrderedDict[str, float] = OrderedDict()
+        self._usage: dict[int, int] = {}
+        self._last_used: dict[int, datetime] = {}
+        self._lock = threading.Lock()
+
+    def _load(self, db: Session, prefix: str) -> CachedAPIKey | None:
+        statement = (
+            select(APIKey)
+            .options(joinedload(APIKey.role).joinedload(Role.apis))
+            .where(APIKey.prefix == prefix)
+        )
+        api_key = db.scalars(statement).unique().first()
+        if api_key is None or api_key.revoked_at is not None:
+            return None
+        role = api_key.role
+        permissions = permission_mask((api.api_name for api in role.apis), is_superuser=role.is_superuser)
+        return CachedAPIKey(id=api_key.id, key_hash=api_key.key_hash, role_name=role.name, permissions=permissions)
+
+    @staticmethod
+    def _remember(table: OrderedDict, prefix: str, value, max_entries: int) -> None:
+        table[prefix] = value
+        table.move_to_end(prefix)
+        while len(table) > max_entries:
+            table.popitem(last=False)
+
+    def _lookup(self, db: Session, prefix: str) -> CachedAPIKey | None:
+        now = time.monotonic()
+        with self._lock:
+            entry = self._cache.get(prefix)
+            unknown_until = self._unknown.get(prefix)
+        if entry is not None and entry[1] > now:
+            return entry[0]
+        if unknown_until is not None and unknown_until > now:
+            return None
+
+        cached = self._load(db, prefix)
+        expires = now + settings.api_key_cache_ttl_seconds
+        with self._lock:
+            if cached is None:
+                self._cache.pop(prefix, None)
+                self._remember(self._unknown, prefix, expires, NEGATIVE_CACHE_MAX_ENTRIES)
+            else:
+                self._unknown.pop(prefix, None)
+                self._remember(self._cache, prefix, (cached, expires), settings.api_key_cache_max_entries)
+        return cached
+
+    def authenticate(self, db: Session, key: str) -> CachedAPIKey | None:
+        prefix = api_key_prefix(key)
+        if prefix is None:
+            return None
+        cached = self._lookup(db, prefix)
+        if cached is None or not verify_api_key(key, cached.key_hash):
+            return None
+        with self._lock:
+            self._usage[cached.id] = self._usage.get(cached.id, 0) + 1
+            self._last_used[cached.id] = datetime.utcnow()
+        return cached
+
+    def invalidate(self, prefix: str | None = None) -> None:
+        with self._lock:
+            if prefix is None:
+                self._cache.clear()
+                self._unknown.clear()
+            else:
+                self._cache.pop(prefix, None)
+                self._unknown.pop(prefix, None)
+
+    def flush_usage(self) -> None:
+        """Write the accumulated usage counters in a single batched UPDATE."""
+        with self._lock:
+            usage, self._usage = self._usage, {}
+            last_used, self._last_used = self._last_used, {}
+        if not usage:
+            return
+        table = APIKey.__table__
+        statement = (
+            update(table)
+            .where(table.c.id == bindparam("key_id"))
+            .values(usage_count=table.c.usage_count + bindparam("uses"), last_used_at=bindparam("used_at"))
+        )
+        rows = [{"key_id": key_id, "uses": uses, "used_at": last_used[key_id]} for key_id, uses in usage.items()]
+        with SessionLocal() as session:
+            session.connection().execute(statement, rows)
+            session.commit()
+
+    async def run_flusher(self) -> None:
+        while True:
+            await asyncio.sleep(settings.api_key_usage_flush_seconds)
+            try:
+                await anyio.to_thread.run_sync(self.flush_usage)
+            except Exception as exc:  # pragma: no cover - depends on database availability
+                logger.warning("Failed to flush API key usage: %s", exc)
+
+
+api_key_service = APIKeyService()
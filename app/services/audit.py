@@ -0,0 +1,141 @@
+from __future__ import annotations
+
+import logging
+import queue
+import threading
+import time
+from collections import Counter
+from datetime import datetime
+
+from sqlalchemy import insert
+
+from app.core.config import settings
+from app.db.session import SessionLocal
+from app.models import AuditEvent
+
+logger = logging.getLogger(__name__)
+
+
+class AuditLogger:
+    """Queues audit events in memory and bulk-inserts them from a background thread.
+
+    Recording is a non-blocking queue append. When the queue is full the event is dropped and
+    counted; the counts are written as ``audit.dropped`` rows with the next batch.
+    """
+
+    def __init__(self, *, max_queue: int, batch_size: int, flush_interval: float) -> None:
+        self._queue: queue.Queue[dict] = queue.Queue(maxsize=max_queue)
+        self._batch_size = batch_size
+        self._flush_interval = flush_interval
+        self._dropped: Counter[str] = Counter()
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    @property
+    def dropped(self) -> dict[str, int]:
+        with self._lock:
+            return dict(self._dropped)
+
+    def record(
+        self,
+        event_type: str,
+        *,
+        identifier: str | None = None,
+        user_id: int | None = None,
+        client_ip: str | None = None,
+        detail: str | None = None,
+    ) -> None:
+        if not settings.audit_enabled:
+            return
+        event = {
+            "event_type": event_type,
+            "identifier": identifier[:255] if identifier else None,
+            "user_id": user_id,
+            "client_ip": client_ip,
+            "detail": detail[:255] if detail else None,
+            "created_at": datetime.utcnow(),
+        }
+        try:
+            self._queue.put_nowait(event)
+        except queue.Full:
+            with self._lock:
+                self._dropped[event_type] += 1
+
+    def start(self) -> None:
+        if self._thread is not None:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="audit-flusher", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        if self._thread is None:
+            return
+        self._stop.set()
+        self._thread.join()
+        self._thread = None
+        self.flush()
+
+    def flush(self) -> None:
+        """Write everything queued right now, in batches."""
+        while True:
+            batch = self._take_batch(deadline=None)
+            if not batch and not self._dropped:
+                return
+            self._write(batch)
+            if not batch:
+                return
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            batch = self._take_batch(deadline=time.monotonic() + self._flush_interval)
+            if batch or self._dropped:
+                self._write(batch)
+
+    def _take_batch(self, *, deadline: float | None) -> list[dict]:
+        """Collect up to a batch of events, waiting until ``deadline`` (or not at all when None)."""
+        batch: list[dict] = []
+        while len(batch) < self._batch_size:
+            try:
+                if deadline is None:
+                    batch.append(self._queue.get_nowait())
+                else:
+                    batch.append(self._queue.get(timeout=max(0.0, deadline - time.monotonic())))
+            except queue.Empty:
+                break
+        return batch
+
+    def _write(self, batch: list[dict]) -> None:
+        with self._lock:
+            dropped, self._dropped = self._dropped, Counter()
+        rows = batch + [
+            {
+                "event_type": "audit.dropped",
+                "identifier": None,
+                "user_id": None,
+                "client_ip": None,
+                "detail": f"{event_type}={count}",
+                "created_at": datetime.utcnow(),
+            }
+            for event_type, count in dropped.items()
+        ]
+        if not rows:
+            return
+        try:
+            with SessionLocal() as session:
+                session.execute(insert(AuditEvent), rows)
+                session.commit()
+        except Exception as exc:  # pragma: no cover - depends on database availability
+            logger.warning("Failed to write %d audit events: %s", len(rows), exc)
+            with self._lock:
+                for row in batch:
+                    self._dropped[row["event_type"]] += 1
+                self._dropped.update(dropped)
+
+
+audit_logger = AuditLogger(
+    max_queue=settings.audit_queue_size,
+    batch_size=settings.audit_batch_size,
+    flush_interval=settings.audit_flush_seconds,
+)
@@ -0,0 +1,105 @@
+from __future__ import annotations
+
+import logging
+import threading
+from typing import Callable
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.db.session import SessionLocal, engine
+from app.models.cache_version import PERMISSIONS_CHANNEL, PERMISSIONS_VERSION_KEY, CacheVersion
+
+logger = logging.getLogger(__name__)
+
+
+def current_permissions_version(session: Session) -> int:
+    return session.scalar(select(CacheVersion.version).where(CacheVersion.name == PERMISSIONS_VERSION_KEY)) or 0
+
+
+class InvalidationBus:
+    """Tells every worker when role/permission data changed so in-process caches can be dropped.
+
+    Writes bump the `cache_versions` row (see `app.models.cache_version`). Workers compare it against the
+    version they last saw: on Postgres they wake up on `LISTEN` notifications, elsewhere (and as a
+    fallback for missed notifications) they poll every `INVALIDATION_POLL_SECONDS`.
+    """
+
+    def __init__(self, *, backend: str, poll_interval: float) -> None:
+        self._backend = backend
+        self._poll_interval = poll_interval
+        self._subscribers: list[Callable[[], None]] = []
+        self._version: int | None = None
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def subscribe(self, callback: Callable[[], None]) -> None:
+        self._subscribers.append(callback)
+
+    def invalidate(self) -> None:
+        """Drop every subscribed cache in this worker."""
+        for callback in self._subscribers:
+            try:
+                callback()
+            except Exception as exc:  # pragma: no cover - subscriber bug should not stop the bus
+                logger.warning("Cache invalidation callback %r failed: %s", callback, exc)
+
+    def check(self) -> None:
+        with SessionLocal() as session:
+            version = current_permissions_version(session)
+        if self._version is not None and version != self._version:
+            self.invalidate()
+        self._version = version
+
+    def start(self) -> None:
+        if self._thread is not None:
+            return
+        self.check()
+        use_listen = self._backend == "listen" or (
+            self._backend == "auto" and engine.dialect.name == "postgresql"
+        )
+        target = self._listen if use_listen else self._poll
+        self._stop.clear()
+        self._thread = threading.Thread(target=target, name="invalidation-bus", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        if self._thread is None:
+            return
+        self._stop.set()
+        self._thread.join(timeout=self._poll_interval * 2)
+        self._thread = None
+
+    def _poll(self) -> None:
+        while not self._stop.wait(self._poll_interval):
+            try:
+                self.check()
+            except Exception as exc:  # pragma: no cover - depends on database availability
+                logger.warning("Permission version poll failed: %s", exc)
+
+    def _listen(self) -> None:
+        while not self._stop.is_set():
+            raw = None
+            try:
+                raw = engine.raw_connection()
+                connection = raw.driver_connection
+                connection.autocommit = True
+                connection.execute(f"LISTEN {PERMISSIONS_CHANNEL}")
+                while not self._stop.is_set():
+                    # Re-check after every notification burst and at least once per poll interval.
+                    for _ in connection.notifies(timeout=self._poll_interval):
+                        break
+                    self.check()
+            except Exception as exc:  # pragma: no cover - depends on database availability
+                logger.warning("Permission LISTEN connection failed, retrying: %s", exc)
+                self._stop.wait(self._poll_interval)
+            finally:
+                if raw is not None:
+                    raw.invalidate()
+
+
+invalidation_bus = InvalidationBus(
+    backend=settings.invalidation_backend,
+    poll_interval=settings.invalidation_poll_seconds,
+)
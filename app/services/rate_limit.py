@@ -0,0 +1,152 @@
+from __future__ import annotations
+
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Protocol
+
+from app.core.config import settings
+
+
+class RateLimitStore(Protocol):
+    """Backend holding token buckets and failure counters; swap in a shared store for multi-host setups."""
+
+    def take(self, key: str, *, capacity: float, refill_per_second: float) -> float:
+        """Consume one token and return 0, or return the seconds until a token is available."""
+
+    def lockout_remaining(self, key: str) -> float:
+        ...
+
+    def record_failure(self, key: str, *, threshold: int, base_seconds: float, max_seconds: float) -> None:
+        ...
+
+    def clear_failures(self, key: str) -> None:
+        ...
+
+
+@dataclass
+class _Bucket:
+    tokens: float
+    updated: float
+
+
+@dataclass
+class _Failures:
+    count: int
+    locked_until: float
+    expires: float
+
+
+class InMemoryRateLimitStore:
+    """Process-local store; keys are evicted least-recently-used once ``max_keys`` is reached."""
+
+    def __init__(self, max_keys: int) -> None:
+        self._max_keys = max_keys
+        self._buckets: OrderedDict[str, _Bucket] = OrderedDict()
+        self._failures: OrderedDict[str, _Failures] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _remember(self, table: OrderedDict, key: str, value) -> None:
+        table[key] = value
+        table.move_to_end(key)
+        while len(table) > self._max_keys:
+            table.popitem(last=False)
+
+    def take(self, key: str, *, capacity: float, refill_per_second: float) -> float:
+        now = time.monotonic()
+        with self._lock:
+            bucket = self._buckets.get(key)
+            if bucket is None:
+                bucket = _Bucket(tokens=capacity, updated=now)
+            else:
+                bucket.tokens = min(capacity, bucket.tokens + (now - bucket.updated) * refill_per_second)
+                bucket.updated = now
+            self._remember(self._buckets, key, bucket)
+            if bucket.tokens >= 1:
+                bucket.tokens -= 1
+                return 0.0
+            return (1 - bucket.tokens) / refill_per_second
+
+    def lockout_remaining(self, key: str) -> float:
+        now = time.monotonic()
+        with self._lock:
+            failures = self._failures.get(key)
+            if failures is None:
+                return 0.0
+            if failures.expires <= now:
+                del self._failures[key]
+                return 0.0
+            return max(0.0, failures.locked_until - now)
+
+    def record_failure(self, key: str, *, threshold: int, base_seconds: float, max_seconds: float) -> None:
+        now = time.monotonic()
+        with self._lock:
+            failures = self._failures.get(key)
+            if failures is None or failures.expires <= now:
+                failures = _Failures(count=0, locked_until=0.0, expires=now)
+            failures.count += 1
+            if failures.count >= threshold:
+                delay = min(max_seconds, base_seconds * 2 ** (failures.count - threshold))
+                failures.locked_until = now + delay
+            # Forget the streak once a full maximum lockout has passed without new failures.
+            failures.expires = max(failures.locked_until, now) + max_seconds
+            self._remember(self._failures, key, failures)
+
+    def clear_failures(self, key: str) -> None:
+        with self._lock:
+            self._failures.pop(key, None)
+
+
+class LoginThrottle:
+    """Token buckets per identifier + client IP and per client IP, plus exponential lockout after repeated failures.
+
+    Nothing is keyed on the identifier alone: attempts from other clients must never throttle the real user.
+    """
+
+    def __init__(self, store: RateLimitStore) -> None:
+        self.store = store
+
+    @staticmethod
+    def _client_key(identifier: str, client_ip: str) -> str:
+        # Scoped to the attacking client so the real user can still sign in from elsewhere.
+        return f"{identifier.strip().lower()}:{client_ip}"
+
+    def _lockout_key(self, identifier: str, client_ip: str) -> str:
+        return f"lockout:{self._client_key(identifier, client_ip)}"
+
+    def check(self, identifier: str, client_ip: str) -> float:
+        """Return 0 when the attempt may proceed, otherwise the number of seconds to wait."""
+        if not settings.login_rate_limit_enabled:
+            return 0.0
+        locked = self.store.lockout_remaining(self._lockout_key(identifier, client_ip))
+        if locked:
+            return locked
+        retry_after = self.store.take(
+            f"ip:{client_ip}",
+            capacity=settings.login_ip_rate_per_minute,
+            refill_per_second=settings.login_ip_rate_per_minute / 60,
+        )
+        if retry_after:
+            return retry_after
+        return self.store.take(
+            f"id:{self._client_key(identifier, client_ip)}",
+            capacity=settings.login_identifier_rate_per_minute,
+            refill_per_second=settings.login_identifier_rate_per_minute / 60,
+        )
+
+    def record_failure(self, identifier: str, client_ip: str) -> None:
+        if not settings.login_rate_limit_enabled:
+            return
+        self.store.record_failure(
+            self._lockout_key(identifier, client_ip),
+            threshold=settings.login_lockout_threshold,
+            base_seconds=settings.login_lockout_base_seconds,
+            max_seconds=settings.login_lockout_max_seconds,
+        )
+
+    def record_success(self, identifier: str, client_ip: str) -> None:
+        self.store.clear_failures(self._lockout_key(identifier, client_ip))
+
+
+login_throttle = LoginThrottle(InMemoryRateLimitStore(max_keys=settings.login_rate_limit_max_keys))
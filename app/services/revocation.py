@@ -0,0 +1,81 @@
+from __future__ import annotations
+
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import delete, select
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models import RevokedToken
+
+# Revocations are fetched by `revoked_at`; re-reading a short window covers rows whose
+# transaction committed after a neighbouring worker already advanced the cursor.
+SYNC_OVERLAP = timedelta(seconds=30)
+
+
+def _to_timestamp(value: datetime) -> float:
+    return value.replace(tzinfo=timezone.utc).timestamp()
+
+
+class RevocationStore:
+    """Per-worker denylist of revoked access token ids, synced incrementally from the database.
+
+    Entries are kept only until the revoked token would have expired anyway, so memory stays
+    bounded by the number of revocations still inside their token lifetime.
+    """
+
+    def __init__(self, sync_interval: float) -> None:
+        self._sync_interval = sync_interval
+        self._expires: dict[str, float] = {}
+        self._cursor: datetime | None = None
+        self._next_sync = 0.0
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._expires)
+
+    def is_revoked(self, jti: str) -> bool:
+        expires = self._expires.get(jti)
+        return expires is not None and expires > time.time()
+
+    def add(self, jti: str, expires_at: datetime) -> None:
+        self._expires[jti] = _to_timestamp(expires_at)
+
+    def revoke(self, db: Session, *, jti: str, expires_at: datetime, user_id: int | None = None) -> None:
+        """Persist a revocation so other workers pick it up, and apply it locally right away."""
+        now = datetime.utcnow()
+        if db.scalar(select(RevokedToken.id).where(RevokedToken.jti == jti)) is None:
+            db.add(RevokedToken(jti=jti, user_id=user_id, expires_at=expires_at, revoked_at=now))
+        # Rows past their token's expiry can never match again.
+        db.execute(delete(RevokedToken).where(RevokedToken.expires_at <= now))
+        db.commit()
+        self.add(jti, expires_at)
+
+    def sync(self, db: Session, *, force: bool = False) -> None:
+        """Pull revocations recorded since the last sync; a no-op until the interval elapses."""
+        now = time.monotonic()
+        if not force and now < self._next_sync:
+            return
+        with self._lock:
+            if not force and now < self._next_sync:
+                return
+            self._next_sync = now + self._sync_interval
+            started = datetime.utcnow()
+            statement = select(RevokedToken.jti, RevokedToken.expires_at).where(RevokedToken.expires_at > started)
+            if self._cursor is not None:
+                statement = statement.where(RevokedToken.revoked_at >= self._cursor - SYNC_OVERLAP)
+            for jti, expires_at in db.execute(statement):
+                self.add(jti, expires_at)
+            self._cursor = started
+            self._prune()
+
+    def _prune(self) -> None:
+        now = time.time()
+        expired = [jti for jti, expires in self._expires.items() if expires <= now]
+        for jti in expired:
+            del self._expires[jti]
+
+
+revocation_store = RevocationStore(sync_interval=settings.revocation_sync_interval_seconds)
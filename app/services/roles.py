@@ -0,0 +1,54 @@
+from __future__ import annotations
+
+import threading
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session, joinedload
+
+from app.core.config import settings
+from app.models import Role, RoleAPI
+from app.schemas import RoleSchema
+
+DEFAULT_ROLE_PERMISSIONS = ("files:profile-picture",)
+
+
+class RoleCache:
+    """Role snapshots by name, so signup resolves roles without a query; cleared by the invalidation bus."""
+
+    def __init__(self) -> None:
+        self._roles: dict[str, RoleSchema] = {}
+        self._lock = threading.Lock()
+
+    def get(self, db: Session, name: str) -> RoleSchema | None:
+        role = self._roles.get(name)
+        if role is not None:
+            return role
+        statement = select(Role).options(joinedload(Role.apis)).where(Role.name == name)
+        loaded = db.scalars(statement).unique().first()
+        if loaded is None:
+            return None
+        role = RoleSchema.model_validate(loaded)
+        with self._lock:
+            self._roles[name] = role
+        return role
+
+    def clear(self) -> None:
+        with self._lock:
+            self._roles.clear()
+
+
+def ensure_default_role(session: Session) -> None:
+    """Create the signup default role and its permissions if missing, off the request path."""
+    role = session.scalars(select(Role).where(Role.name == settings.default_role_name)).first()
+    if role is None:
+        role = Role(name=settings.default_role_name, description="Default role created on demand")
+        session.add(role)
+        session.flush()
+    existing = {api.api_name for api in role.apis}
+    for api_name in DEFAULT_ROLE_PERMISSIONS:
+        if api_name not in existing:
+            session.add(RoleAPI(role_id=role.id, api_name=api_name))
+    session.commit()
+
+
+role_cache = RoleCache()
@@ -0,0 +1,308 @@
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import json
+import math
+import os
+import platform
+import time
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Awaitable, Callable
+
+import typer
+
+bench = typer.Typer(help="Load-test and benchmark the auth and permission hot paths")
+
+BENCH_PASSWORD = "BenchPass123!"
+BENCH_USER_PREFIX = "bench"
+# The upload route only checks the declared content type, so a PNG signature is enough.
+PNG_PAYLOAD = b"\x89PNG\r\n\x1a\n" + b"\x00" * 1024
+SCENARIOS = ("login", "me", "finance", "upload")
+COMPARED_METRICS = {"p50_ms": "higher", "p95_ms": "higher", "p99_ms": "higher", "throughput_rps": "lower"}
+
+
+@dataclass
+class ScenarioResult:
+    name: str
+    latencies_ms: list[float] = field(default_factory=list)
+    errors: int = 0
+    elapsed_s: float = 0.0
+
+    def summary(self) -> dict[str, float | int]:
+        ordered = sorted(self.latencies_ms)
+        total = len(ordered) + self.errors
+        return {
+            "requests": total,
+            "errors": self.errors,
+            "error_rate": round(self.errors / total, 4) if total else 0.0,
+            # Only successful requests count, so fast failures (429/503) cannot inflate throughput.
+            "throughput_rps": round(len(ordered) / self.elapsed_s, 2) if self.elapsed_s else 0.0,
+            "mean_ms": round(sum(ordered) / len(ordered), 3) if ordered else 0.0,
+            "p50_ms": _percentile(ordered, 50),
+            "p95_ms": _percentile(ordered, 95),
+            "p99_ms": _percentile(ordered, 99),
+        }
+
+
+def _percentile(ordered: list[float], pct: float) -> float:
+    if not ordered:
+        return 0.0
+    rank = min(len(ordered) - 1, max(0, math.ceil(pct / 100 * len(ordered)) - 1))
+    return round(ordered[rank], 3)
+
+
+def _bench_username(role_name: str, index: int) -> str:
+    return f"{BENCH_USER_PREFIX}_{role_name}_{index}"
+
+
+def seed_benchmark_data(users_per_role: int) -> None:
+    """Insert the dummy roles plus ``users_per_role`` users for each of them."""
+    from sqlalchemy import select
+
+    from app import models  # noqa: F401
+    from app.cli import DUMMY_ROLE_DEFINITIONS, _get_or_create_role
+    from app.core.security import hash_password
+    from app.db import Base
+    from app.db.session import SessionLocal, engine
+    from app.models import User
+
+    Base.metadata.create_all(bind=engine)
+    # bcrypt is deliberately slow, so every seeded user shares a single hash.
+    hashed_password = hash_password(BENCH_PASSWORD)
+    with SessionLocal() as session:
+        for role_def in DUMMY_ROLE_DEFINITIONS:
+            role = _get_or_create_role(session, **role_def)
+            session.flush()
+            existing = set(
+                session.scalars(
+                    select(User.username).where(User.username.like(f"{BENCH_USER_PREFIX}_{role.name}_%"))
+                )
+            )
+            for index in range(users_per_role):
+                username = _bench_username(role.name, index)
+                if username in existing:
+                    continue
+                session.add(
+                    User(
+                        username=username,
+                        email=f"{username}@bench.example.com",
+                        first_name="Bench",
+                        last_name=str(index),
+                        hashed_password=hashed_password,
+                        role=role,
+                    )
+                )
+        session.commit()
+
+
+async def _login(client, username: str) -> str:
+    response = await client.post("/api/auth/login", json={"username": username, "password": BENCH_PASSWORD})
+    response.raise_for_status()
+    return response.json()["access_token"]
+
+
+async def _drive(
+    name: str,
+    send: Callable[[int], Awaitable[Any]],
+    *,
+    requests: int,
+    concurrency: int,
+    warmup: int,
+) -> ScenarioResult:
+    for index in range(warmup):
+        await send(index)
+
+    result = ScenarioResult(name=name)
+    counter = iter(range(requests))
+
+    async def worker() -> None:
+        for index in counter:
+            started = time.perf_counter()
+            try:
+                response = await send(index)
+            except Exception:  # noqa: BLE001 - transport errors count as failed requests
+                result.errors += 1
+                continue
+            if response.status_code >= 400:
+                result.errors += 1
+                continue
+            result.latencies_ms.append((time.perf_counter() - started) * 1000)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    result.elapsed_s = time.perf_counter() - started
+    return result
+
+
+async def _run_scenarios(
+    client,
+    *,
+    scenarios: list[str],
+    users_per_role: int,
+    requests: int,
+    concurrency: int,
+    warmup: int,
+) -> dict[str, ScenarioResult]:
+    from app.core.config import settings
+
+    basic_users = [_bench_username(settings.default_role_name, i) for i in range(users_per_role)]
+    finance_users = [_bench_username("finance_analyst", i) for i in range(users_per_role)]
+    basic_tokens = [await _login(client, username) for username in basic_users]
+    finance_tokens = [await _login(client, username) for username in finance_users]
+
+    def bearer(tokens: list[str], index: int) -> dict[str, str]:
+        return {"Authorization": f"Bearer {tokens[index % len(tokens)]}"}
+
+    senders: dict[str, Callable[[int], Awaitable[Any]]] = {
+        "login": lambda i: client.post(
+            "/api/auth/login",
+            json={"username": basic_users[i % len(basic_users)], "password": BENCH_PASSWORD},
+        ),
+        "me": lambda i: client.get("/api/users/me", headers=bearer(basic_tokens, i)),
+        "finance": lambda i: client.get("/api/dummy/reports/finance", headers=bearer(finance_tokens, i)),
+        "upload": lambda i: client.post(
+            "/api/files/profile-picture",
+            headers=bearer(basic_tokens, i),
+            files={"file": ("bench.png", PNG_PAYLOAD, "image/png")},
+        ),
+    }
+
+    results: dict[str, ScenarioResult] = {}
+    for name in scenarios:
+        results[name] = await _drive(
+            name, senders[name], requests=requests, concurrency=concurrency, warmup=warmup
+        )
+    return results
+
+
+def compare_results(baseline: dict, current: dict, threshold: float) -> list[str]:
+    """Return a human readable line for every metric that regressed beyond ``threshold``."""
+    regressions: list[str] = []
+    for name, metrics in current.get("scenarios", {}).items():
+        reference = baseline.get("scenarios", {}).get(name)
+        if not reference:
+            continue
+        # Any growth in failures is a regression, whatever the threshold.
+        for metric in ("errors", "error_rate"):
+            before, after = reference.get(metric, 0), metrics.get(metric, 0)
+            if after > before:
+                regressions.append(f"{name}.{metric}: {before} -> {after}")
+        for metric, worse_when in COMPARED_METRICS.items():
+            before, after = reference.get(metric), metrics.get(metric)
+            if not before or after is None:
+                continue
+            change = (after - before) / before
+            if (worse_when == "higher" and change > threshold) or (worse_when == "lower" and -change > threshold):
+                regressions.append(f"{name}.{metric}: {before} -> {after} ({change:+.1%})")
+    return regressions
+
+
+def _report_comparison(baseline_path: Path, current: dict, threshold: float) -> None:
+    baseline = json.loads(baseline_path.read_text())
+    regressions = compare_results(baseline, current, threshold)
+    if regressions:
+        typer.echo(f"Regressions against {baseline_path} (threshold {threshold:.0%}):")
+        for line in regressions:
+            typer.echo(f"  {line}")
+        raise typer.Exit(code=1)
+    typer.echo(f"No regressions against {baseline_path} (threshold {threshold:.0%})")
+
+
+@bench.command("run")
+def run(
+    database_url: str = typer.Option(
+        "sqlite:///./bench.db", help="Database to seed; must match the server's DATABASE_URL for --base-url runs"
+    ),
+    base_url: str | None = typer.Option(None, help="Benchmark a running server over HTTP instead of in-process"),
+    users_per_role: int = typer.Option(10, min=1, help="Users seeded for every dummy role"),
+    requests: int = typer.Option(200, min=1, help="Measured requests per scenario"),
+    concurrency: int = typer.Option(10, min=1, help="Concurrent in-flight requests"),
+    warmup: int = typer.Option(5, min=0, help="Unmeasured requests sent before each scenario"),
+    scenario: list[str] = typer.Option(list(SCENARIOS), help="Scenarios to run (repeat the option to pick several)"),
+    output: Path | None = typer.Option(None, help="Write the JSON results to this file"),
+    baseline: Path | None = typer.Option(None, help="Compare against a stored baseline and fail on regressions"),
+    threshold: float = typer.Option(0.10, help="Allowed relative regression before failing"),
+    skip_seed: bool = typer.Option(False, help="Reuse previously seeded benchmark users"),
+    login_rate_limit: bool = typer.Option(
+        False, help="Keep login throttling on for in-process runs (it rejects most repeated benchmark logins)"
+    ),
+    admission_control: bool = typer.Option(
+        False, help="Keep admission control on for in-process runs (it sheds logins beyond the auth limit)"
+    ),
+) -> None:
+    unknown = sorted(set(scenario) - set(SCENARIOS))
+    if unknown:
+        raise typer.BadParameter(f"Unknown scenarios: {', '.join(unknown)}")
+
+    # Settings are read at import time, so the target database must be set before importing the app.
+    os.environ["DATABASE_URL"] = database_url
+    if not base_url and not login_rate_limit:
+        os.environ["LOGIN_RATE_LIMIT_ENABLED"] = "false"
+    if not base_url and not admission_control:
+        os.environ["ADMISSION_CONTROL_ENABLED"] = "false"
+    import httpx
+
+    if not skip_seed:
+        seed_benchmark_data(users_per_role)
+
+    async def _main() -> dict[str, ScenarioResult]:
+        limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+        async with contextlib.AsyncExitStack() as stack:
+            if base_url:
+                client = httpx.AsyncClient(base_url=base_url, limits=limits, timeout=60)
+            else:
+                from app.main import app
+
+                # ASGITransport skips lifespan events; run startup/shutdown so the app matches a deployment.
+                await stack.enter_async_context(app.router.lifespan_context(app))
+                transport = httpx.ASGITransport(app=app)
+                client = httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=60)
+            await stack.enter_async_context(client)
+            return await _run_scenarios(
+                client,
+                scenarios=scenario,
+                users_per_role=users_per_role,
+                requests=requests,
+                concurrency=concurrency,
+                warmup=warmup,
+            )
+
+    results = asyncio.run(_main())
+    report = {
+        "meta": {
+            "created_at": datetime.now(tz=timezone.utc).isoformat(),
+            "mode": "http" if base_url else "in-process",
+            "base_url": base_url,
+            "database_url": database_url,
+            "users_per_role": users_per_role,
+            "requests": requests,
+            "concurrency": concurrency,
+            "python": platform.python_version(),
+            "machine": platform.machine(),
+        },
+        "scenarios": {name: result.summary() for name, result in results.items()},
+    }
+
+    rendered = json.dumps(report, indent=2)
+    if output:
+        output.write_text(rendered + "\n")
+    typer.echo(rendered)
+
+    if baseline:
+        _report_comparison(baseline, report, threshold)
+
+
+@bench.command("compare")
+def compare(
+    baseline: Path = typer.Argument(..., exists=True, help="Stored baseline JSON"),
+    current: Path = typer.Argument(..., exists=True, help="Fresh results JSON"),
+    threshold: float = typer.Option(0.10, help="Allowed relative regression before failing"),
+) -> None:
+    _report_comparison(baseline, json.loads(current.read_text()), threshold)
+
+
+if __name__ == "__main__":
+    bench()